@@ -1,26 +1,38 @@
 """
 The goal/point of this script is to extract employment search data by parsing pdfs.
-To parse the pdfs, we imported the pdfplumber library: https://github.com/jsvine/pdfplumber
+To parse the pdfs, we imported the PyMuPDF library (fitz): https://github.com/pymupdf/PyMuPDF
 Numerous libraries like numpy, pandas, re were imported to handle input and output operations
 """
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import pdfplumber
+import fitz
+from unit_text_utils import (
+    clean, is_percent, is_label, method_key,
+    unit_order, unit_rank, canonicalize_unit, page_lines, extract_unit_candidate,
+)
 
 reports = "GraduationSurveyReports"
-rows = [] # This variable is used to just extract the table row data to later transform into a DataFrame
+# Columns of the method rows
+ROW_COLUMNS = ("pdf", "Unit", "method", "Method", "percent")
 
 """
-The following regex patterns are used to define what a percent looks like in the data 
-percent_re matches all numbers with percent sign like 90.0% or <1%
+The following regex pattern is used to define what a percent looks like in the data 
 pct_anywhere checks if there is a percent somwhere inside a line
+(the gap before % never crosses a line break, so it can run over many joined lines at once)
 """
-percent_re = re.compile(r"^<?\d+(?:\.\d+)?%$")
-pct_anywhere = re.compile(r"(<?\d+(?:\.\d+)?)\s*%")
+pct_anywhere = re.compile(r"(<?\d+(?:\.\d+)?)[^\S\n]*%")
 
-# A filter for words that are common and aren't real labels
-HEADER_WORDS = {"method", "methods", "used", "find", "employment", "search"}
+# Section heading pattern
+EMP_SEARCH_RE = re.compile(
+    r"employment\s+search|method\s+used\s+to\s+find\s+employment|methods\s+of\s+employment",
+    re.I,
+)
+# The filename year patterns are plain strings because only pandas .str.extract/.extractall use them
+YEAR_PREFIX_PAT = r"^(20\d{2})"
+YEAR_RANGE_PAT = r"(20\d{2})\s*[-–]\s*(20\d{2})"
+YEAR_ANY_PAT = r"(20\d{2})"
 
 # Markers to tell the script when to stop parsing
 STOP_MARKERS = (
@@ -38,17 +50,10 @@ STOP_MARKERS = (
     "unresolved",
     "salary",
 )
-# HELPER FUNCTIONS ;)
-
-# Function to convert input to a string and remove any and all whitespaces
-def clean(x):
-    if x is None:
-        return ""
-    return str(x).replace("\n", " ").strip()
+# All stop markers folded into one pattern so each line is scanned once
+STOP_RE = re.compile("|".join(re.escape(m) for m in STOP_MARKERS))
 
-# Remove spaces and detects if input is a percentage
-def is_percent(x):
-    return bool(percent_re.match(clean(x).replace(" ", "")))
+# HELPER FUNCTIONS ;)
 
 # Checks if line contains ONLY a percent
 def is_percent_only_line(ln: str) -> bool:
@@ -66,171 +71,12 @@ def pct_to_num(pct: str) -> float:
     except ValueError:
         return -1.0
 
-# Checks whether or not input is a valid label
-def is_label(s):
-    s = clean(s)
-    if not s:
-        return False
-    if is_percent(s):
-        return False
-    if s.replace(",", "").isdigit():
-        return False
-
-    low = s.lower()
-    words = re.findall(r"[a-z]+", low)
-    if not words:
-        return False
-
-    if all(w in HEADER_WORDS for w in words):
-        return False
-
-    return any(ch.isalpha() for ch in s)
-
-# The officiial list of units
-unit_order = [
-    "University-wide",
-    "College of Agriculture and Natural Resources",
-    "College of Arts and Humanities",
-    "College of Behavioral and Social Sciences",
-    "College of Computer, Mathematical, and Natural Sciences",
-    "College of Education",
-    "College of Information",
-    "The A. James Clark School of Engineering",
-    "Philip Merrill College of Journalism",
-    "School of Architecture, Planning, and Preservation",
-    "School of Public Health",
-    "School of Public Policy",
-    "The Robert H. Smith School of Business",
-    "College Park Scholars",
-    "Honors College",
-    "Letters and Sciences",
-    "Undergraduate Studies",
-]
-
-# clean unit strings + detect University-wide
-def normalize_unit(u: str) -> str:
-    u = str(u or "").strip()
-    u = re.sub(r"\s+", " ", u)
-    u = u.replace("–", "-").replace("—", "-")
-
-    low = u.lower()
-
-    if "university of maryland" in low and "overall" in low:
-        return "University-wide"
-    if re.search(r"university\s*[- ]\s*wide|universitywide", low):
-        return "University-wide"
-    if low == "university of maryland":
-        return "University-wide"
-
-    return u
-
-# build a “matching key” for unit strings
-def unit_key(s: str) -> str:
-    s = str(s or "").lower()
-    s = s.replace("–", "-").replace("—", "-")
-    s = s.replace("&", " and ")
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    toks = [t for t in s.split() if t != "and"]
-    return " ".join(toks)
-
-unit_lookup = {unit_key(u): u for u in unit_order}
-unit_lookup[unit_key("Phillip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
-unit_lookup[unit_key("Philip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
-unit_lookup[unit_key("Robert H. Smith School of Business")] = "The Robert H. Smith School of Business"
-unit_lookup[unit_key("Robert H Smith School of Business")] = "The Robert H. Smith School of Business"
-unit_lookup[unit_key("Office of Undergraduate Studies")] = "Undergraduate Studies"
-unit_lookup[unit_key("Division of Undergraduate Studies")] = "Undergraduate Studies"
-unit_lookup[unit_key("College of Information Studies")] = "College of Information"
-
-def canonicalize_unit(u: str) -> str:
-    u = normalize_unit(u)
-    k = unit_key(u)
-    if k in unit_lookup:
-        return unit_lookup[k]
-    return u
-
-# Extracts the first 60 lines to look for units
-def extract_unit_candidate(page_text: str):
-    lines = [ln.strip() for ln in (page_text or "").split("\n") if ln.strip()]
-    max_scan = min(60, len(lines))
-
-    def test_candidate(s: str):
-        s = s.replace(" ,", ",")
-        cand = canonicalize_unit(s)
-        return cand if cand in unit_order else None
-
-    for i in range(max_scan):
-        hit = test_candidate(lines[i])
-        if hit:
-            return hit
-
-        if i + 1 < max_scan:
-            two = (lines[i].rstrip(",") + " " + lines[i + 1]).strip()
-            hit = test_candidate(two)
-            if hit:
-                return hit
-
-        if i + 2 < max_scan:
-            three = (lines[i].rstrip(",") + " " + lines[i + 1] + " " + lines[i + 2]).strip()
-            hit = test_candidate(three)
-            if hit:
-                return hit
-
-    return None
-
-# Standardize method labels
-def method_key(s: str):
-    s = (s or "").lower()
-    s = re.sub(r"\s+", " ", s).strip()
-
-    if "intern" in s or "co-op" in s or "coop" in s:
-        return "Previous Internship/Co-op %"
-
-    if "career fair" in s or "career fairs" in s:
-        if "non-umd" in s or "non umd" in s or "off campus" in s or "off-campus" in s:
-            return "Career Fairs Off Campus %"
-        if "umd" in s:
-            return "Career Fairs On Campus %"
-        return "Career Fairs On Campus %"
-
-    if "non-umd" in s or "non umd" in s:
-        if ("online" in s) or ("job site" in s) or ("jobsite" in s) or ("company website" in s) or ("company site" in s) or ("social media" in s):
-            return "Non-UMD Online Job Site %"
-
-    if ("umd online job site" in s) or ("handshake" in s) or ("hiresmith" in s) or ("careers4terps" in s):
-        if "non-umd" not in s and "non umd" not in s:
-            return "UMD Online Job Site %"
-
-    if "interview" in s:
-        if ("on campus" in s) or ("on-campus" in s) or ("campus/virtual" in s) or ("virtual" in s):
-            return "On-campus Interviews %"
-
-    if ("family" in s or "friends" in s) and ("contact" in s or "contacts" in s):
-        return "Contacts Family/Friends %"
-    if ("faculty" in s or "staff" in s) and ("contact" in s or "contacts" in s):
-        return "Contacts Faculty %"
-
-    if "currently employed" in s:
-        return "Currently Employed with Org %"
-
-    if "newspaper" in s:
-        return "Newspaper %"
-    if s.strip() == "other":
-        return "Other %"
-
-    return None
-
 # Detect if a page contains the employment-search section
 def page_has_employment_search(page_text: str):
-    return bool(re.search(
-        r"employment\s+search|method\s+used\s+to\s+find\s+employment|methods\s+of\s+employment",
-        page_text or "",
-        re.I
-    ))
+    return bool(EMP_SEARCH_RE.search(page_text or ""))
 
 # Not all data is in table form, so this method extracts from the text itself
-def parse_ep_from_text(page_text: str):
+def parse_ep_from_text(page_text: str, lines: tuple):
     page_low = (page_text or "").lower()
 
     idx_es = page_low.find("employment search")
@@ -238,27 +84,45 @@ def parse_ep_from_text(page_text: str):
     if idx_es != -1 and idx_tfr != -1 and idx_tfr > idx_es:
         return []
 
-    lines = [ln.strip() for ln in (page_text or "").splitlines() if ln.strip()]
+    lines_low = [ln.lower() for ln in lines] # lowered once, shared by the header search and the main loop
 
     start = None
-    for i, ln in enumerate(lines):
-        ln_low = ln.lower()
+    for i, ln_low in enumerate(lines_low):
         if "employment search" in ln_low or "method used to find employment" in ln_low or "methods of employment" in ln_low:
             start = i
             break
     if start is None:
         return []
 
+    body = lines[start + 1:]
+    body_low = lines_low[start + 1:]
+
+    # Parsing ends at the first line holding a stop marker; one search over the joined block finds it
+    block_low = "\n".join(body_low)
+    stop = STOP_RE.search(block_low)
+    if stop:
+        n_body = block_low.count("\n", 0, stop.start())
+        body = body[:n_body]
+        body_low = body_low[:n_body]
+
+    # Every percent in the block from a single finditer, bucketed back to its line
+    # with line-relative offsets so the labels between them can still be sliced out per line
+    block = "\n".join(body)
+    line_pcts = [[] for _ in body]
+    line_no = 0
+    line_start = 0
+    for m in pct_anywhere.finditer(block):
+        nl = block.count("\n", line_start, m.start())
+        if nl:
+            line_no += nl
+            line_start = block.rfind("\n", 0, m.start()) + 1
+        line_pcts[line_no].append((m.group(1), m.start() - line_start, m.end() - line_start))
+
     out = []
     pending_label = None
     pending_pct = None
 
-    for ln in lines[start + 1:]:
-        line_low = ln.lower()
-
-        if any(m in line_low for m in STOP_MARKERS):
-            break
-
+    for ln, line_low, matches in zip(body, body_low, line_pcts):
         if "based on" in line_low and "responses" in line_low:
             continue
         if "method used to find employment" in line_low or "methods of employment" in line_low:
@@ -275,13 +139,12 @@ def parse_ep_from_text(page_text: str):
                 pending_pct = clean(ln)
             continue
 
-        matches = list(pct_anywhere.finditer(ln))
         if matches:
             prev_end = 0
-            for m in matches:
-                pct = m.group(1).replace(" ", "") + "%"
-                label = ln[prev_end:m.start()].strip(" -:\t")
-                prev_end = m.end()
+            for num, m_start, m_end in matches:
+                pct = num.replace(" ", "") + "%"
+                label = ln[prev_end:m_start].strip(" -:\t")
+                prev_end = m_end
 
                 if not label and pending_label:
                     label = pending_label
@@ -315,117 +178,113 @@ def parse_ep_from_text(page_text: str):
 
     return dedup
 
-# Gets the year associated with the file
-def infer_year_from_filename(fname: str):
-    m = re.match(r"^(20\d{2})", fname)
-    if m:
-        return int(m.group(1))
-
-    m = re.search(r"(20\d{2})\s*[-–]\s*(20\d{2})", fname)
-    if m:
-        return int(m.group(2))
-
-    years = re.findall(r"20\d{2}", fname)
-    return max(map(int, years)) if years else None
+# Reads every page's text up front so the pdf is closed before parsing
+def read_page_texts(pdf_path: str) -> list:
+    with fitz.open(pdf_path) as doc:
+        return [page.get_text("text") or "" for page in doc]
 
-"""
-This is the main block of code that runs the script 
-that splits and scans PDFs, pages, tables
-"""
+# Parses one pdf's employment-search sections into {column: values}
+def process_pdf(pdf_path: str) -> dict:
+    file = os.path.basename(pdf_path)
+    cols = {c: [] for c in ROW_COLUMNS}
 
-for file in os.listdir(reports):
-    if not file.endswith(".pdf"):
-        continue
+    current_unit = None
 
-    pdf_path = os.path.join(reports, file)
+    for page_text in read_page_texts(pdf_path):
+        lines = page_lines(page_text)
 
-    with pdfplumber.open(pdf_path) as pdf:
-        current_unit = None
+        # Cheap section check first: a unit header is only taken from pages
+        # without the employment-search section, so only those need the unit scan
+        if not page_has_employment_search(page_text):
+            unit_here = extract_unit_candidate(lines)
+            if unit_here:
+                current_unit = unit_here
+            continue
 
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
+        if not current_unit:
+            continue
 
-            unit_here = extract_unit_candidate(page_text)
-            if unit_here and not page_has_employment_search(page_text):
-                current_unit = unit_here
+        parsed = parse_ep_from_text(page_text, lines)
 
-            if not current_unit:
-                continue
+        best_for_method = {}
 
-            if not page_has_employment_search(page_text):
+        for label, pct in parsed:
+            mk = method_key(label)
+            if not mk:
                 continue
 
-            parsed = parse_ep_from_text(page_text)
-
-            best_for_method = {}
-
-            for label, pct in parsed:
-                mk = method_key(label)
-                if not mk:
-                    continue
-
-                if (mk not in best_for_method) or (pct_to_num(pct) > pct_to_num(best_for_method[mk][1])):
-                    best_for_method[mk] = (label, pct)
-
-            for mk, (label, pct) in best_for_method.items():
-                rows.append({
-                    "pdf": file,
-                    "Unit": current_unit,
-                    "method": label,
-                    "Method": mk,
-                    "percent": pct,
-                })
-
-df = pd.DataFrame(rows)
-print("Extracted rows:", len(df))
-
-df["Year"] = df["pdf"].apply(infer_year_from_filename).astype("Int64")
-df["Unit"] = df["Unit"].apply(canonicalize_unit)
-
-method_columns = [
-    "On-campus Interviews %",
-    "Previous Internship/Co-op %",
-    "Career Fairs On Campus %",
-    "Career Fairs Off Campus %",
-    "UMD Online Job Site %",
-    "Non-UMD Online Job Site %",
-    "Contacts Faculty %",
-    "Contacts Family/Friends %",
-    "Currently Employed with Org %",
-    "Newspaper %",
-    "Other %",
-]
-
-wide = (
-    df.pivot_table(
-        index=["Unit", "Year"],
-        columns="Method",
-        values="percent",
-        aggfunc="first",
-    )
-    .reset_index()
-)
-
-for c in method_columns:
-    if c not in wide.columns:
-        wide[c] = pd.NA
+            if (mk not in best_for_method) or (pct_to_num(pct) > pct_to_num(best_for_method[mk][1])):
+                best_for_method[mk] = (label, pct)
 
-wide = wide[["Unit", "Year"] + method_columns]
+        for mk, (label, pct) in best_for_method.items():
+            cols["pdf"].append(file)
+            cols["Unit"].append(current_unit)
+            cols["method"].append(label)
+            cols["Method"].append(mk)
+            cols["percent"].append(pct)
 
-all_years = sorted(df["Year"].dropna().astype(int).unique())
-full_index = pd.MultiIndex.from_product([unit_order, all_years], names=["Unit", "Year"])
+    return cols
 
-wide = (
-    wide.set_index(["Unit", "Year"])
-        .reindex(full_index)
-        .reset_index()
-)
+"""
+This is the main block of code that runs the script 
+that splits and scans PDFs (in parallel), pages, tables
+"""
+if __name__ == "__main__":
+    columns = {c: [] for c in ROW_COLUMNS} # The table row data, one list per column, to later transform into a DataFrame
+    paths = [os.path.join(reports, file) for file in os.listdir(reports) if file.endswith(".pdf")]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for pdf_columns in ex.map(process_pdf, paths, chunksize=2):
+            for c in ROW_COLUMNS:
+                columns[c].extend(pdf_columns[c])
+
+    df = pd.DataFrame(columns, copy=False)
+    print("Extracted rows:", len(df))
+
+    # The year of each file: a year at the start of the name, else the end of a year range
+    # (e.g. 2019-2020), else the largest year anywhere in the name
+    lead_year = df["pdf"].str.extract(YEAR_PREFIX_PAT)[0]
+    range_year = df["pdf"].str.extract(YEAR_RANGE_PAT)[1]
+    max_year = df["pdf"].str.extractall(YEAR_ANY_PAT)[0].astype(int).groupby(level=0).max()
+    df["Year"] = pd.to_numeric(lead_year.fillna(range_year)).fillna(max_year).astype("Int64")
+
+    # Only a few distinct unit strings exist, so canonicalize each one once and map
+    canon_cache = {u: canonicalize_unit(u) for u in df["Unit"].unique()}
+    df["Unit"] = df["Unit"].map(canon_cache)
+
+    method_columns = [
+        "On-campus Interviews %",
+        "Previous Internship/Co-op %",
+        "Career Fairs On Campus %",
+        "Career Fairs Off Campus %",
+        "UMD Online Job Site %",
+        "Non-UMD Online Job Site %",
+        "Contacts Faculty %",
+        "Contacts Family/Friends %",
+        "Currently Employed with Org %",
+        "Newspaper %",
+        "Other %",
+    ]
+
+    all_years = sorted(df["Year"].dropna().astype(int).unique())
+    full_index = pd.MultiIndex.from_product([unit_order, all_years], names=["Unit", "Year"])
+
+    # First percent per (Unit, Year, Method), spread into one column per method.
+    # The reindex adds the blank rows and any method columns that never appeared
+    wide = (
+        df.groupby(["Unit", "Year", "Method"], sort=False)["percent"]
+            .first()
+            .unstack("Method")
+            .reindex(index=full_index, columns=method_columns)
+            .reset_index()
+    )
 
-wide["Unit_cat"] = pd.Categorical(wide["Unit"], categories=unit_order, ordered=True)
-wide = (
-    wide.sort_values(["Year", "Unit_cat"], ascending=[True, True])
-        .drop(columns=["Unit_cat"])
-        .reset_index(drop=True)
-)
+    # Sort by Year, then by each unit's position in unit_order (a small int key instead of a Categorical)
+    wide["_urank"] = wide["Unit"].map(unit_rank).astype("int16")
+    wide = (
+        wide.sort_values(["Year", "_urank"], ascending=[True, True])
+            .drop(columns=["_urank"])
+            .reset_index(drop=True)
+    )
 
-wide.to_csv("employment_search_week2.csv", index=False)
+    wide.to_csv("employment_search_week2.csv", index=False)
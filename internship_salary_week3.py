@@ -1,37 +1,23 @@
 """
 The goal/point of this project is to extract Internship wage data by parsing pdfs.
-To parse the pdfs, we imported the pdfplumber library: https://github.com/jsvine/pdfplumber
+To parse the pdfs, we imported the PyMuPDF library (fitz): https://github.com/pymupdf/PyMuPDF
 Numerous libraries like numpy, pandas, re were imported to handle input and output operations
 """
 
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import pdfplumber
+import fitz
+from unit_text_utils import unit_order, unit_rank, canonicalize_unit, page_lines, extract_unit_candidate
 
 reports = "GraduationSurveyReports"
-rows = []
-
-# The following is a list of how we want our units to be ordered
-unit_order = [
-    "University-wide",
-    "College of Agriculture and Natural Resources",
-    "College of Arts and Humanities",
-    "College of Behavioral and Social Sciences",
-    "College of Computer, Mathematical, and Natural Sciences",
-    "College of Education",
-    "College of Information",
-    "The A. James Clark School of Engineering",
-    "Philip Merrill College of Journalism",
-    "School of Architecture, Planning, and Preservation",
-    "School of Public Health",
-    "School of Public Policy",
-    "The Robert H. Smith School of Business",
-    "College Park Scholars",
-    "Honors College",
-    "Letters and Sciences",
-    "Undergraduate Studies",
-]
+# Columns of the wage rows
+ROW_COLUMNS = (
+    "Year", "Unit",
+    "Internship Wage N", "Internship Wage Average", "Internship Wage Median",
+    "pdf", "page", "priority",
+)
 
 # Some PDFs use abbreviations in footers to indicate what section you’re in.
 # This dictiotionary simply translates them over
@@ -60,6 +46,24 @@ ABBR_TO_UNIT = {
 # Regex patterns that finds a match for footers 
 FOOTER_ABBR_RE = re.compile(r"\b([A-Z]{3,8})\s+\d{1,3}\s*$")
 FOOTER_TRAILNUM_RE = re.compile(r"^(?P<txt>.+?)\s+(?P<num>\d{1,3})\s*$")
+FOOTER_OVERALL_RE = re.compile(r"\boverall\b", re.I)
+
+# Whitespace and filename year patterns
+WS_RE = re.compile(r"\s+")
+YEAR_PREFIX_RE = re.compile(r"^(20\d{2})")
+YEAR_RANGE_RE = re.compile(r"(20\d{2})\s*[-–]\s*(20\d{2})")
+YEAR_ANY_RE = re.compile(r"20\d{2}")
+
+# Pie chart leftovers removed by strip_chart_artifacts: the chart title first (removing it can bring
+# a slice label and its value together), then the slices in one alternation:
+# a slice label with its value, a bare percent, and a bare slice label
+CHART_TITLE_RE = re.compile(r"internships?\s*-\s*compensation", re.I)
+CHART_SLICE_RE = re.compile(
+    r"\b(?:yes|no|other|paid|unpaid)\b\s*\d+(?:\.\d+)?\s*%?"
+    r"|\d+(?:\.\d+)?\s*%"
+    r"|\b(?:yes|no|other)\b",
+    re.I,
+)
 
 
 
@@ -68,22 +72,22 @@ FOOTER_TRAILNUM_RE = re.compile(r"^(?P<txt>.+?)\s+(?P<num>\d{1,3})\s*$")
 # cleans the data in order to make strings consistent from any whitespaces
 def normalize_whitespace(s: str) -> str:
     s = (s or "").replace("\xa0", " ")
-    return re.sub(r"\s+", " ", s).strip()
+    return WS_RE.sub(" ", s).strip()
 
 # Gets the year of the data
 def infer_year_from_filename(fname: str):
     base = os.path.basename(fname) # Returns the file name
 
     # once a filename is returned we match using regex patterns
-    m = re.match(r"^(20\d{2})", base)
+    m = YEAR_PREFIX_RE.match(base)
     if m:
         return int(m.group(1))
 
-    m = re.search(r"(20\d{2})\s*[-–]\s*(20\d{2})", base)
+    m = YEAR_RANGE_RE.search(base)
     if m:
         return int(m.group(2))
 
-    years = re.findall(r"20\d{2}", base)
+    years = YEAR_ANY_RE.findall(base)
     return int(years[0]) if years else None
 
 # Converts strings to ints
@@ -99,72 +103,9 @@ def to_float(s):
     except ValueError:
         return None
 
-# Removes and fixes any fuzzy punctuation for consistency throughout the years
-def unit_key(s: str) -> str:
-    s = str(s or "").lower()
-    s = s.replace("–", "-").replace("—", "-")
-    s = s.replace("&", " and ")
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    toks = [t for t in s.split() if t != "and"]
-    return " ".join(toks)
-
-# Some years have typos so unit_lookup was created to catch all the typos
-unit_lookup = {unit_key(u): u for u in unit_order}
-unit_lookup[unit_key("Phillip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
-unit_lookup[unit_key("College of Information Studies")] = "College of Information"
-unit_lookup[unit_key("Robert H. Smith School of Business")] = "The Robert H. Smith School of Business"
-unit_lookup[unit_key("Robert H Smith School of Business")] = "The Robert H. Smith School of Business"
-unit_lookup[unit_key("Office of Undergraduate Studies")] = "Undergraduate Studies"
-unit_lookup[unit_key("Division of Undergraduate Studies")] = "Undergraduate Studies"
-
-# Normalizes all units and find matches 
-# whilst also looking for different variations for university wide
-def canonicalize_unit(u: str) -> str:
-    u = normalize_whitespace(u).replace("–", "-").replace("—", "-")
-    low = u.lower().strip()
-
-    if re.search(r"university\s*[- ]\s*wide|universitywide", low):
-        return "University-wide"
-    if low == "university of maryland":
-        return "University-wide"
-    if "university of maryland" in low and "overall" in low:
-        return "University-wide"
-
-    return unit_lookup.get(unit_key(u), u)
-
-# Scan first ~60 lines for a unit name (handles wrapped titles)
-def extract_unit_candidate(page_text: str):
-    lines = [ln.strip() for ln in (page_text or "").splitlines() if ln.strip()]
-    max_scan = min(60, len(lines))
-
-    def test(s: str):
-        cand = canonicalize_unit(s.replace(" ,", ","))
-        return cand if cand in unit_order else None
-
-    for i in range(max_scan):
-        hit = test(lines[i])
-        if hit:
-            return hit
-
-        if i + 1 < max_scan:
-            two = (lines[i].rstrip(",") + " " + lines[i + 1]).strip()
-            hit = test(two)
-            if hit:
-                return hit
-
-        if i + 2 < max_scan:
-            three = (lines[i].rstrip(",") + " " + lines[i + 1] + " " + lines[i + 2]).strip()
-            hit = test(three)
-            if hit:
-                return hit
-
-    return None
-
 # This function checks only the bottom of the page for footers.
-def extract_unit_from_footer(page_text: str):
+def extract_unit_from_footer(lines: tuple):
 
-    lines = [ln.strip() for ln in (page_text or "").splitlines() if ln.strip()]
     for ln in reversed(lines[-12:]):
         m = FOOTER_ABBR_RE.search(ln)
         if m:
@@ -178,7 +119,7 @@ def extract_unit_from_footer(page_text: str):
             if cand in unit_order:
                 return cand
 
-        if re.search(r"\boverall\b", ln, flags=re.I):
+        if FOOTER_OVERALL_RE.search(ln):
             return "University-wide"
 
     return None
@@ -191,9 +132,8 @@ def extract_unit_anywhere(page_text: str):
     return max(hits, key=len) if hits else None
 
 
-def page_starts_with_unit(page_text: str):
+def page_starts_with_unit(lines: tuple):
 
-    lines = [ln.strip() for ln in (page_text or "").splitlines() if ln.strip()]
     if not lines:
         return None
 
@@ -207,14 +147,14 @@ def page_starts_with_unit(page_text: str):
 
 # Look ahead ONLY for pages that actually START a unit section (top lines),
 # not pages that merely mention units in an index/table.
-def lookahead_unit_start(pdf, page_index: int, max_ahead: int = 1):
+# lines_by_page holds the already-split lines of every page, so no page is extracted or split twice
+def lookahead_unit_start(lines_by_page: list, page_index: int, max_ahead: int = 1):
 
     for j in range(1, max_ahead + 1):
         k = page_index + j
-        if k >= len(pdf.pages):
+        if k >= len(lines_by_page):
             break
-        nxt = pdf.pages[k].extract_text() or ""
-        u = page_starts_with_unit(nxt)
+        u = page_starts_with_unit(lines_by_page[k])
         if u:
             return u
     return None
@@ -224,36 +164,26 @@ def lookahead_unit_start(pdf, page_index: int, max_ahead: int = 1):
 # Strip pie chart data using regex
 def strip_chart_artifacts(text: str) -> str:
     t = normalize_whitespace(text)
-    t = re.sub(r"internships?\s*-\s*compensation", " ", t, flags=re.I)
-    t = re.sub(r"\b(?:yes|no|other|paid|unpaid)\b\s*\d+(?:\.\d+)?\s*%?", " ", t, flags=re.I)
-    t = re.sub(r"\d+(?:\.\d+)?\s*%", " ", t)
-    t = re.sub(r"\b(?:yes|no|other)\b", " ", t, flags=re.I)
+    t = CHART_TITLE_RE.sub(" ", t)
+    t = CHART_SLICE_RE.sub(" ", t)
     return normalize_whitespace(t)
 
 
 
 # Finally we have the parsers that look for the patterns like hourly wage
-# or paid/unpaid to get wage metrics
-SENT_GAP = r"(?:(?![.?!]).){0,260}?"
-
-WAGE_PATTERNS = [
-    re.compile(
-        rf"\b(?:of|for)\s+(?:the\s+)?(?P<n>[\d,]+)\s+(?:internship\s+)?experiences\b"
-        rf"{SENT_GAP}\b(?:that\s+)?(?:paid|include(?:d)?|with)\b"
-        rf"{SENT_GAP}\bhourly\b{SENT_GAP}\b(?:wage|rate)\b"
-        rf"{SENT_GAP}(?:average|mean)\b.*?\$?\s*(?P<avg>\d+(?:\.\d+)?)(?!\s*%)"
-        rf"{SENT_GAP}\bmedian\b.*?\$?\s*(?P<med>\d+(?:\.\d+)?)(?!\s*%)",
-        re.I,
-    ),
-    re.compile(
-        rf"\b(?:of|for)\s+(?:the\s+)?(?P<n>[\d,]+)\s+(?:internship\s+)?experiences\b"
-        rf"{SENT_GAP}\b(?:that\s+)?(?:paid|include(?:d)?|with)\b"
-        rf"{SENT_GAP}\bhourly\b{SENT_GAP}\b(?:wage|rate)\b"
-        rf"{SENT_GAP}\bmedian\b.*?\$?\s*(?P<med>\d+(?:\.\d+)?)(?!\s*%)"
-        rf"{SENT_GAP}(?:average|mean)\b.*?\$?\s*(?P<avg>\d+(?:\.\d+)?)(?!\s*%)",
-        re.I,
-    ),
-]
+# or paid/unpaid to get wage metrics.
+# A wage sentence reads "... of N experiences that paid ... hourly ... wage/rate ... average $X ... median $Y"
+# (average and median may come in either order). Rather than one big regex with tempered gaps,
+# which backtracks badly on long pages, find_wage_metrics steps through these small patterns with forward searches
+SENT_GAP = 260 # Max characters between two consecutive parts of the sentence
+SENT_END_RE = re.compile(r"[.?!]")
+EXPERIENCES_N_RE = re.compile(r"\b(?:of|for)\s+(?:the\s+)?(?P<n>[\d,]+)\s+(?:internship\s+)?experiences\b", re.I)
+PAID_RE = re.compile(r"\b(?:that\s+)?(?:paid|include(?:d)?|with)\b", re.I)
+HOURLY_RE = re.compile(r"\bhourly\b", re.I)
+WAGE_RATE_RE = re.compile(r"\b(?:wage|rate)\b", re.I)
+AVG_RE = re.compile(r"(?:average|mean)\b", re.I)
+MEDIAN_RE = re.compile(r"\bmedian\b", re.I)
+DOLLAR_RE = re.compile(r"\$?\s*(\d+(?:\.\d+)?)(?!\s*%)")
 
 ONE_WAGE_RE = re.compile(
     r"\b(?:one|1)\s+experience\b.*?\bpaid\b.*?\bhourly\b.*?\b(?:wage|rate)\b.*?"
@@ -266,23 +196,57 @@ TOTAL_EXPERIENCES_RE = re.compile(
     re.I,
 )
 
+# Finds the next match of rx that starts within SENT_GAP characters of pos without crossing a sentence end
+def next_in_sentence(rx, text: str, pos: int):
+    m = rx.search(text, pos)
+    if not m or m.start() - pos > SENT_GAP:
+        return None
+    end = SENT_END_RE.search(text, pos, m.start())
+    return None if end else m
+
+# The keyword orders a wage sentence can use: (first keyword, second keyword, whether the first is the average)
+WAGE_ORDERS = ((AVG_RE, MEDIAN_RE, True), (MEDIAN_RE, AVG_RE, False))
+
+# Walks each "of N experiences" sentence and returns (n, avg, med) from the first one that has both wages
+def find_wage_metrics(cleaned: str):
+    for mn in EXPERIENCES_N_RE.finditer(cleaned):
+        m = next_in_sentence(PAID_RE, cleaned, mn.end())
+        m = m and next_in_sentence(HOURLY_RE, cleaned, m.end())
+        m = m and next_in_sentence(WAGE_RATE_RE, cleaned, m.end())
+        if not m:
+            continue
+        n = to_int(mn.group("n"))
+
+        # Average first, then median first, like the two orders of the old WAGE_PATTERNS.
+        # Each amount is the first number after its keyword, and the second keyword must follow in the same sentence
+        for first_re, second_re, avg_first in WAGE_ORDERS:
+            first = next_in_sentence(first_re, cleaned, m.end())
+            amount1 = first and DOLLAR_RE.search(cleaned, first.end())
+            second = amount1 and next_in_sentence(second_re, cleaned, amount1.end())
+            amount2 = second and DOLLAR_RE.search(cleaned, second.end())
+            if not amount2:
+                continue
+
+            v1 = to_float(amount1.group(1))
+            v2 = to_float(amount2.group(1))
+            avg, med = (v1, v2) if avg_first else (v2, v1)
+            if n is None or avg is None or med is None:
+                continue
+            if not (0 < avg < 100 and 0 < med < 100):
+                continue
+            return n, avg, med
+
+    return None
+
 def parse_metrics(page_text: str):
     cleaned = strip_chart_artifacts(page_text)
     low = cleaned.lower()
 
     # Wage metrics first
     if ("hourly" in low) and (("wage" in low) or ("rate" in low)) and ("median" in low) and (("average" in low) or ("mean" in low)):
-        for pat in WAGE_PATTERNS:
-            m = pat.search(cleaned)
-            if not m:
-                continue
-            n = to_int(m.group("n"))
-            avg = to_float(m.group("avg"))
-            med = to_float(m.group("med"))
-            if n is None or avg is None or med is None:
-                continue
-            if not (0 < avg < 100 and 0 < med < 100):
-                continue
+        wage = find_wage_metrics(cleaned)
+        if wage:
+            n, avg, med = wage
             return {"n": n, "avg": avg, "med": med, "priority": 2}
 
         m = ONE_WAGE_RE.search(cleaned)
@@ -302,119 +266,132 @@ def parse_metrics(page_text: str):
     return None
 
 
-"""
-This is the main block of code that runs the script 
-that splits and scans PDFs, pages, tables
-"""
-pdf_files = sorted([f for f in os.listdir(reports) if f.lower().endswith(".pdf")])
-
-years_in_folder = sorted({
-    infer_year_from_filename(f)
-    for f in pdf_files
-    if infer_year_from_filename(f) is not None
-})
+# Reads every page's text up front so the pdf is closed before parsing (a failed page reads as "")
+def read_page_texts(pdf_path: str) -> list:
+    page_texts = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            try:
+                page_texts.append(page.get_text("text") or "")
+            except Exception:
+                page_texts.append("")
+    return page_texts
 
+# Parses one pdf's per-unit internship wages into {column: values}
+def process_pdf(pdf_path: str) -> dict:
+    file = os.path.basename(pdf_path)
+    cols = {c: [] for c in ROW_COLUMNS}
 
-for file in pdf_files:
     year = infer_year_from_filename(file)
     if year is None:
-        continue
-
-    pdf_path = os.path.join(reports, file)
+        return cols
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            current_unit = None
-
-            for page_index, page in enumerate(pdf.pages):
-                try:
-                    raw = page.extract_text() or ""
-                except Exception:
-                    continue
-
-                if not raw.strip():
-                    continue
-
-                # Detect unit on this page (best -> worst)
-                page_unit = (
-                    extract_unit_candidate(raw)
-                    or extract_unit_from_footer(raw)
-                    or extract_unit_anywhere(raw)
-                )
-
-                if page_unit:
-                    current_unit = page_unit
-
-                metrics = parse_metrics(raw)
-                if not metrics:
-                    continue
-
-                # Only lookahead if the NEXT page *starts* a unit section.
-                if page_unit:
-                    unit = page_unit
+        page_texts = read_page_texts(pdf_path)
+        lines_by_page = [page_lines(t) for t in page_texts]
+        current_unit = None
+
+        for page_index, raw in enumerate(page_texts):
+            lines = lines_by_page[page_index]
+            if not lines:
+                continue
+
+            # Detect unit on this page (best -> worst)
+            page_unit = (
+                extract_unit_candidate(lines)
+                or extract_unit_from_footer(lines)
+                or extract_unit_anywhere(raw)
+            )
+
+            if page_unit:
+                current_unit = page_unit
+
+            metrics = parse_metrics(raw)
+            if not metrics:
+                continue
+
+            # Only lookahead if the NEXT page *starts* a unit section.
+            if page_unit:
+                unit = page_unit
+            else:
+                la = lookahead_unit_start(lines_by_page, page_index, max_ahead=1)
+                if la:
+                    unit = la
+                    current_unit = la
                 else:
-                    la = lookahead_unit_start(pdf, page_index, max_ahead=1)
-                    if la:
-                        unit = la
-                        current_unit = la
-                    else:
-                        unit = current_unit or "University-wide"
-
-                unit = canonicalize_unit(unit)
-
-                rows.append({
-                    "Year": year,
-                    "Unit": unit,
-                    "Internship Wage N": metrics["n"],
-                    "Internship Wage Average": (round(metrics["avg"], 2) if metrics["avg"] is not None else None),
-                    "Internship Wage Median": (round(metrics["med"], 2) if metrics["med"] is not None else None),
-                    "pdf": file,
-                    "page": page_index + 1,
-                    "priority": metrics["priority"],
-                })
+                    unit = current_unit or "University-wide"
+
+            unit = canonicalize_unit(unit)
+
+            cols["Year"].append(year)
+            cols["Unit"].append(unit)
+            cols["Internship Wage N"].append(metrics["n"])
+            cols["Internship Wage Average"].append(round(metrics["avg"], 2) if metrics["avg"] is not None else None)
+            cols["Internship Wage Median"].append(round(metrics["med"], 2) if metrics["med"] is not None else None)
+            cols["pdf"].append(file)
+            cols["page"].append(page_index + 1)
+            cols["priority"].append(metrics["priority"])
 
     except Exception:
-        continue
-
-# Build df
-df = pd.DataFrame(
-    rows,
-    columns=[
-        "Year", "Unit",
-        "Internship Wage N", "Internship Wage Average", "Internship Wage Median",
-        "pdf", "page", "priority",
-    ],
-)
+        pass
 
-# Deduplicate per (Year, Unit): prefer wage metrics (priority=2), then earliest page
-if not df.empty:
-    df = (
-        df.sort_values(["Year", "Unit", "priority", "page"], ascending=[True, True, False, True])
-          .drop_duplicates(["Year", "Unit"], keep="first")
-          .reset_index(drop=True)
-    )
+    return cols
 
-# Full Year x Unit grid
-full_index = pd.MultiIndex.from_product([years_in_folder, unit_order], names=["Year", "Unit"])
-out = (
-    df.set_index(["Year", "Unit"])
-      .reindex(full_index)
-      .reset_index()
-)
 
-# Using pandas to format our CSV the way want to
-out["Year"] = out["Year"].astype("Int64")
-out["Internship Wage N"] = pd.to_numeric(out["Internship Wage N"], errors="coerce").astype("Int64")
-out["Internship Wage Average"] = pd.to_numeric(out["Internship Wage Average"], errors="coerce")
-out["Internship Wage Median"] = pd.to_numeric(out["Internship Wage Median"], errors="coerce")
-
-# Final columns/order
-out = out[["Unit", "Year", "Internship Wage N", "Internship Wage Average", "Internship Wage Median"]]
-out["Unit_cat"] = pd.Categorical(out["Unit"], categories=unit_order, ordered=True)
-out = (
-    out.sort_values(["Year", "Unit_cat"], ascending=[True, True])
-       .drop(columns=["Unit_cat"])
-       .reset_index(drop=True)
-)
+"""
+This is the main block of code that runs the script 
+that splits and scans PDFs (in parallel), pages, tables
+"""
+if __name__ == "__main__":
+    columns = {c: [] for c in ROW_COLUMNS}
+    pdf_files = sorted([f for f in os.listdir(reports) if f.lower().endswith(".pdf")])
+
+    years_in_folder = sorted({
+        infer_year_from_filename(f)
+        for f in pdf_files
+        if infer_year_from_filename(f) is not None
+    })
+
+    paths = [os.path.join(reports, f) for f in pdf_files]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for pdf_columns in ex.map(process_pdf, paths, chunksize=2):
+            for c in ROW_COLUMNS:
+                columns[c].extend(pdf_columns[c])
+
+    # Build df
+    df = pd.DataFrame(columns, copy=False)
+
+    # Deduplicate per (Year, Unit): prefer wage metrics (priority=2), then earliest page
+    if not df.empty:
+        df = (
+            df.sort_values(["Year", "Unit", "priority", "page"], ascending=[True, True, False, True])
+              .drop_duplicates(["Year", "Unit"], keep="first")
+              .reset_index(drop=True)
+        )
+
+    # Full Year x Unit grid
+    full_index = pd.MultiIndex.from_product([years_in_folder, unit_order], names=["Year", "Unit"])
+    out = (
+        df.set_index(["Year", "Unit"])
+          .reindex(full_index)
+          .reset_index()
+    )
+
+    # Using pandas to format our CSV the way want to
+    out["Year"] = out["Year"].astype("Int64")
+    out["Internship Wage N"] = pd.to_numeric(out["Internship Wage N"], errors="coerce").astype("Int64")
+    out["Internship Wage Average"] = pd.to_numeric(out["Internship Wage Average"], errors="coerce")
+    out["Internship Wage Median"] = pd.to_numeric(out["Internship Wage Median"], errors="coerce")
+
+    # Final columns/order
+    out = out[["Unit", "Year", "Internship Wage N", "Internship Wage Average", "Internship Wage Median"]]
+    # Sort by Year, then by each unit's position in unit_order (a small int key instead of a Categorical)
+    out["_urank"] = out["Unit"].map(unit_rank).astype("int16")
+    out = (
+        out.sort_values(["Year", "_urank"], ascending=[True, True])
+           .drop(columns=["_urank"])
+           .reset_index(drop=True)
+    )
 
-out.to_csv("internship_salary_week3.csv", index=False, na_rep="")
+    out.to_csv("internship_salary_week3.csv", index=False, na_rep="")
@@ -5,21 +5,39 @@ Numerous libraries like numpy, pandas, re were imported to handle input and outp
 """
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import pdfplumber
 import numpy as np
+from unit_text_utils import unit_order, unit_rank
 
 
-rows = [] # This variable is used to just extract the table row data to later transform into a DataFrame
 reports = "GraduationSurveyReports"
+# Columns of the outcome rows
+ROW_COLUMNS = ("pdf", "title", "outcome", "count", "percent")
 
 """
-The following regex patterns are used to define what a percent looks like in the data 
-percent_re matches all numbers with percent sign like 90.0% or <1%
-no_percent_re is the same but without % as it accounts for PDFs that split % into a different cell
+The following regex pattern is used to define what a percent looks like in the data 
+pct_or_num_re matches all numbers with percent sign like 90.0% or <1%,
+and the same numbers without % as it accounts for PDFs that split % into a different cell.
+The "pct" group tells the two apart, so a cell is classified with a single match
 """
-percent_re = re.compile(r"^<?\d+(?:\.\d+)?%$")
-no_percent_re = re.compile(r"^<?\d+(?:\.\d+)?$")
+pct_or_num_re = re.compile(r"^<?\d+(?:\.\d+)?(?P<pct>%)?$")
+
+# Cell, label and page text patterns
+WS_RE = re.compile(r"\s+")
+MULTI_WS_RE = re.compile(r"\s{2,}")
+NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+# University-wide spellings; the plain string is for pandas .str.contains, UNIWIDE_RE for single lines
+UNIWIDE_PAT = r"university\s*[- ]\s*wide|universitywide"
+UNIWIDE_RE = re.compile(UNIWIDE_PAT)
+# Title phrases stripped off table labels, longest first so "reported outcomes of graduates" goes as a whole
+IRRELEVANT_RE = re.compile(r"reported outcomes of graduates|reported outcomes of|graduate outcomes", re.IGNORECASE)
+YEAR_GRAD_RE = re.compile(r"\b20\d{2}\s+graduates\b", re.IGNORECASE)
+TOTAL_RE = re.compile(r"\bTOTAL\b\s+([\d,]+)(?:\s+(\d+(\.\d+)?%))?", re.IGNORECASE)
+NOT_SEEKING_RE = re.compile(r"\bNot\s+Seeking\b\s+([\d,]+)\b", re.IGNORECASE)
+# En and em dashes both become a plain "-" in one pass
+DASH_TABLE = str.maketrans({"–": "-", "—": "-"})
 
 # HELPER FUNCTIONS :)
 
@@ -29,100 +47,107 @@ def clean(x):
         return ""
     return str(x).replace("\n", " ").strip()
 
-# Removes commas so numbers like 5,678 to 5678 and checks if input is all digits
-def is_count(x):
-    x = clean(x).replace(",", "")
-    return x.isdigit()
+# Bit flags describing what a cleaned cell looks like; a cell can be both a count and a number (e.g. "12")
+CELL_COUNT = 1 << 0    # all digits once commas are removed, like 5,678
+CELL_PERCENT = 1 << 1  # a percent like 90.0% or <1%
+CELL_NUMBER = 1 << 2   # a percent whose % sign was split into the next cell
+CELL_LABEL = 1 << 3    # likely a label (E.g “Employed FT”, “Unplaced”)
 
-# Remove spaces and detects if input is a percentage
-def is_percent(x):
-    x = clean(x).replace(" ", "")
-    return bool(percent_re.match(x))
+# Classifies one cleaned cell with a single regex match plus a digit check
+def classify_cell(s: str) -> int:
+    flags = 0
+    if s.replace(",", "").isdigit():
+        flags |= CELL_COUNT
 
-# Decides if a cell is likely a label (E.g “Employed FT”, “Unplaced”) or not checking if it has percents, counts, etc
-def is_label(s):
-    s = clean(s)
-    if not s:
-        return False
-    if is_count(s) or is_percent(s):
-        return False
+    m = pct_or_num_re.match(s.replace(" ", ""))
+    if m:
+        flags |= CELL_PERCENT if m.group("pct") else CELL_NUMBER
+
+    if not s or flags & (CELL_COUNT | CELL_PERCENT):
+        return flags
 
     low = s.lower()
 
     if low in {"outcome", "#", "%"}:
-        return False
+        return flags
     
     # To remove any unwanted label candidates we exclude common titles like "outcome"
     if "reported outcomes" in low or "graduate outcomes" in low:
-        return False
-
-    return True
+        return flags
 
-# Collects all cells that look like labels, chooses the longest
-def find_label(row):
-    labels = [clean(c) for c in row if is_label(c)]
-    return max(labels, key=len) if labels else ""
+    return flags | CELL_LABEL
 
+# Cleans every cell of a row once and classifies it, as two parallel lists.
+# find_label, find_count and find_percent all read these instead of re-cleaning the row's cells
+def row_features(row):
+    cleaned = [clean(c) for c in row]
+    return cleaned, [classify_cell(c) for c in cleaned]
 
-def find_count(row):
-    for cell in row:
-        if is_count(cell):
-            return clean(cell)
-    return ""
+# Looks at all cells that look like labels and keeps the longest (the first one on a tie)
+def find_label(cleaned, classes):
+    best = ""
+    best_len = 0
+    for c, f in zip(cleaned, classes):
+        if f & CELL_LABEL and len(c) > best_len:
+            best, best_len = c, len(c)
+    return best
 
-def find_percent(row):
-    row = row or []
-    for i, cell in enumerate(row):
-        c = clean(cell).replace(" ", "")
 
-        if percent_re.match(c):
+def find_count(cleaned, classes):
+    for c, f in zip(cleaned, classes):
+        if f & CELL_COUNT:
             return c
+    return ""
 
-        if no_percent_re.match(c) and i + 1 < len(row):
-            nxt = clean(row[i + 1]).strip()
-            if nxt == "%":
-                return c + "%"
+def find_percent(cleaned, classes):
+    for i, f in enumerate(classes):
+        if f & CELL_PERCENT:
+            return cleaned[i].replace(" ", "")
+
+        if f & CELL_NUMBER and i + 1 < len(cleaned) and cleaned[i + 1] == "%":
+            return cleaned[i].replace(" ", "") + "%"
 
     return ""
 
-# Extracts all text from page, splits into lines and filters to find the proper tile
-def get_page_title(page):
-    text = page.extract_text() or ""
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-
-    bad_contains = ( # list of common phrases/words to filter out
-        "survey response rate",
-        "knowledge rate",
-        "total placement",
-        "reported outcomes",
-        "graduate outcomes",
-        "as of",
-        "data from",
-        "had been collected",
-        "via the survey",
-        "between",
-    )
+# list of common phrases/words to filter out of page titles, folded into one pattern so a line is scanned once
+BAD_TITLE_PHRASES = (
+    "survey response rate",
+    "knowledge rate",
+    "total placement",
+    "reported outcomes",
+    "graduate outcomes",
+    "as of",
+    "data from",
+    "had been collected",
+    "via the survey",
+    "between",
+)
+BAD_TITLE_RE = re.compile("|".join(re.escape(b) for b in BAD_TITLE_PHRASES))
+
+# Checks to see if the given line is a proper title, by filtering noise
+def is_good_title(ln: str) -> bool:
+    low = ln.lower().strip()
+    
+    if low == "maryland":
+        return False
+    
+    if BAD_TITLE_RE.search(low):
+        return False
 
-    def is_good_title(ln: str) -> bool:
-        # Checks to see if the given line is a proper title, by filtering noise 
-        low = ln.lower().strip()
-        
-        if low == "maryland":
-            return False
-        
-        if any(b in low for b in bad_contains):
-            return False
+    if "%" in ln or "#" in ln:
+        return False
 
-        if "%" in ln or "#" in ln:
-            return False
+    if len(ln) > 80:
+        return False
 
-        if len(ln) > 80:
-            return False
+    if sum(ch.isdigit() for ch in ln) >= 2 and not UNIWIDE_RE.search(low):
+        return False #checks if ln looks too numeric and if it’s not a ‘University-Wide’ label and rejects it
+    
+    return any(ch.isalpha() for ch in ln)
 
-        if sum(ch.isdigit() for ch in ln) >= 2 and not re.search(r"university\s*[- ]\s*wide|universitywide", low):
-            return False #checks if ln looks too numeric and if it’s not a ‘University-Wide’ label and rejects it
-        
-        return any(ch.isalpha() for ch in ln)
+# Splits the page text into lines and filters to find the proper tile
+def get_page_title(page_text: str):
+    lines = [ln.strip() for ln in page_text.split("\n") if ln.strip()]
 
     # The following block checks the first 25 lines to see if titles are wrapped under multiple lines
     start_idx = None
@@ -145,15 +170,22 @@ def get_page_title(page):
 
 # Pages can have multiple tables, this function decides whether its an outcome table
 def is_outcomes_table(table):
+    # A real outcome table names at least one of these key terms in its first rows,
+    # so a single look at all of their text rejects most tables before any row is scored
+    blob = " ".join(str(c) for r in table[:15] if r for c in r if c).lower()
+    if not ("employed" in blob or "unplaced" in blob or "unresolved" in blob):
+        return False, 0
+
     score = 0 # uses a score system to decide which table is likely to be an outcome table
     labels = []
 
     for r in table[:15]:
         if not r:
             continue
-        lab = find_label(r).lower()
-        cnt = find_count(r)
-        pct = find_percent(r)
+        cleaned, classes = row_features(r)
+        lab = find_label(cleaned, classes).lower()
+        cnt = find_count(cleaned, classes)
+        pct = find_percent(cleaned, classes)
 
         if lab:
             labels.append(lab)
@@ -182,26 +214,17 @@ def parse_outcomes_table(table):
         if not r:
             continue
 
-        label = find_label(r)
-        low = label.lower()
-        irrelevant_phrases = [
-            "reported outcomes of graduates",
-            "reported outcomes of",
-            "graduate outcomes",
-        ]
-        
+        cleaned, classes = row_features(r)
+        label = find_label(cleaned, classes)
+
         # This block is used to filter labels so they are clean
         # (E.g "Employed FT” instead of "Reported Outcomes of Graduates Employed FT”)
-        for jp in irrelevant_phrases:
-            if jp in low:
-                label = re.sub(jp, "", label, flags=re.IGNORECASE).strip()
-                low = label.lower()
+        label = IRRELEVANT_RE.sub("", label).strip()
+        label = YEAR_GRAD_RE.sub("", label).strip()
 
-        label = re.sub(r"\b20\d{2}\s+graduates\b", "", label, flags=re.IGNORECASE).strip()
-
-        label = re.sub(r"\s{2,}", " ", label).strip()
-        cnt = find_count(r)
-        pct = find_percent(r)
+        label = MULTI_WS_RE.sub(" ", label).strip()
+        cnt = find_count(cleaned, classes)
+        pct = find_percent(cleaned, classes)
 
         if label and not cnt and not pct:
             if last is not None:       # Append fragment to prior label since row has no count/percent
@@ -244,70 +267,74 @@ def get_total_and_not_seeking(page_text):
     found = []
 
     # Looks for total and a number afterwards
-    m_total = re.search(r"\bTOTAL\b\s+([\d,]+)(?:\s+(\d+(\.\d+)?%))?", page_text, re.IGNORECASE)
+    m_total = TOTAL_RE.search(page_text)
     if m_total:
         found.append({"outcome": "TOTAL", "count": m_total.group(1), "percent": m_total.group(2) or ""})
 
-    m_ns = re.search(r"\bNot\s+Seeking\b\s+([\d,]+)\b", page_text, re.IGNORECASE)
+    m_ns = NOT_SEEKING_RE.search(page_text)
     if m_ns:
         found.append({"outcome": "Not Seeking", "count": m_ns.group(1), "percent": ""})
 
     return found
 
-# NOt all labels are consistent throughout each survey, so we standardize them to make extraction easier
-def outcome_key(s: str):
-    s = (s or "").lower()
-
-    if "employed" in s and "ft" in s: return "Employed FT"
-    if "employed" in s and "pt" in s: return "Employed PT"
-    if "continuing" in s and "education" in s: return "Continuing Edu"
-    if "volunteer" in s or "service program" in s: return "Volunteering"
-    if "military" in s: return "Military"
-    if "business" in s: return "Business"
-    if "unplaced" in s: return "Unplaced"
-    if "unresolved" in s: return "Unresolved"
-    if re.search(r"\btotal\b", s): return "Total"
-    # use regex to prevent weird false matches where “total” appears inside another word
-    if "not seeking" in s: return "Not Seeking"
-    return None
-
-# Converts percent strings to numbers for math
-def pct_to_float(x):
-    x = str(x).strip()
-
-    if not x:
-        return np.nan
-    # For any data that uses <1%, we use 1
-    if x.startswith("<") and x.endswith("%"):
-        return 1.0
+# NOt all labels are consistent throughout each survey, so we standardize them to make extraction easier.
+# Each rule is one vectorized test over the whole column; np.select picks the first rule a label passes
+# (labels that pass none get None)
+def outcome_keys(labels: pd.Series) -> pd.Series:
+    s = labels.fillna("").astype(str).str.lower()
+
+    def has(word):
+        return s.str.contains(word, regex=False)
+
+    employed = has("employed")
+    conds = [
+        employed & has("ft"),
+        employed & has("pt"),
+        has("continuing") & has("education"),
+        has("volunteer") | has("service program"),
+        has("military"),
+        has("business"),
+        has("unplaced"),
+        has("unresolved"),
+        s.str.contains(r"\btotal\b", regex=True), # regex prevents weird false matches where “total” appears inside another word
+        has("not seeking"),
+    ]
+    choices = [
+        "Employed FT", "Employed PT", "Continuing Edu", "Volunteering", "Military",
+        "Business", "Unplaced", "Unresolved", "Total", "Not Seeking",
+    ]
+    return pd.Series(np.select(conds, choices, default=None), index=labels.index)
+
+# Converts a column of percent strings to numbers for math, without a Python call per row.
+# Empty or unreadable values become NaN
+def pct_series_to_float(pcts: pd.Series) -> pd.Series:
+    x = pcts.astype(str).str.strip()
+    # float64 even when every value is a whole number, so the output keeps its 85.0% format
+    num = pd.to_numeric(x.str[:-1], errors="coerce").astype("float64")
 
-    try:
-        return float(x[:-1]) 
-    except ValueError:
-        return np.nan
+    # For any data that uses <1%, we use 1
+    return num.mask(x.str.startswith("<") & x.str.endswith("%"), 1.0)
  
-# Similar to labels, not all units are consistent, so we normalize them for consistency   
-def normalize_unit(u: str) -> str:
-    u = str(u or "").strip()
-    u = re.sub(r"\s+", " ", u)        
-    u = u.replace("–", "-").replace("—", "-")
-
-    low = u.lower()
-    
-    if re.search(r"university\s*[- ]\s*wide|universitywide", low):
-        return "University-wide"
-
-    if "university of maryland" in low and (
-        "university-wide" in low
-        or "university wide" in low
-        or "overall" in low
-        or "graduate survey report" in low):
-        return "University-wide"
-
-    if low == "university of maryland":
-        return "University-wide"
-
-    return u
+# Similar to labels, not all units are consistent, so we normalize them for consistency.
+# Works on the whole Unit column at once with pandas string methods
+def normalize_units(units: pd.Series) -> pd.Series:
+    u = (units.astype(str)
+              .str.translate(DASH_TABLE)
+              .str.replace(WS_RE, " ", regex=True)
+              .str.strip())
+
+    low = u.str.lower()
+
+    # University-wide spellings, plus "University of Maryland" titles that stand for the whole university
+    # (the "university-wide"/"university wide" forms are already covered by UNIWIDE_PAT)
+    umd = low.str.contains("university of maryland", regex=False)
+    uni_wide = (
+        low.str.contains(UNIWIDE_PAT, regex=True)
+        | (umd & low.str.contains("overall", regex=False))
+        | (umd & low.str.contains("graduate survey report", regex=False))
+        | (low == "university of maryland")
+    )
+    return u.mask(uni_wide, "University-wide")
 
 # Processes inputs for simple matching 
 # So units like “College of Computer, Mathematical, and Natural Sciences”
@@ -316,168 +343,183 @@ def unit_key(s: str) -> str:
     s = str(s or "").lower()
     s = s.replace("–", "-").replace("—", "-")
     s = s.replace("&", " and ")
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = NONALNUM_RE.sub(" ", s)
+    s = WS_RE.sub(" ", s).strip()
 
     toks = [t for t in s.split() if t != "and"]
     return " ".join(toks)
 
-# Use previous functions to normalize and map the inputs to official names
-def canonicalize_unit(u: str) -> str:
-    u = normalize_unit(u)
-    k = unit_key(u)
+# Same keys as unit_key, built for a whole column of units at once
+def unit_keys(units: pd.Series) -> pd.Series:
+    return (units.str.lower()
+                 .str.replace("&", " and ", regex=False)
+                 .str.replace(NONALNUM_RE, " ", regex=True)
+                 .str.replace(r"\band\b", " ", regex=True)
+                 .str.replace(WS_RE, " ", regex=True)
+                 .str.strip())
+
+# Maps a column of normalized units to official names with one dict lookup per row.
+# Units whose key has no exact match fall back to a looser substring match,
+# which runs once per distinct unmatched key instead of once per row
+def canonicalize_units(units: pd.Series) -> pd.Series:
+    keys = unit_keys(units)
+    exact = keys.map(unit_lookup)
+
+    loose = {}
+    for k in keys[exact.isna()].unique():
+        for ck, canon in unit_lookup_items:
+            if ck in k:
+                loose[k] = canon
+                break
+
+    return exact.fillna(keys.map(loose)).fillna(units)
 
-    if k in unit_lookup:
-        return unit_lookup[k]
+# Build lookup table to start matching
+unit_lookup = {unit_key(u): u for u in unit_order}
 
-    for ck, canon in unit_lookup_items: #if exact matching fails, we try something looser with substrings
-        if ck in k:
-            return canon
+# Clean inconsistinces with typos in several reports
+unit_lookup[unit_key("Phillip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
+unit_lookup[unit_key("Philip Merrill College of Journalism")]  = "Philip Merrill College of Journalism"
 
-    return u
+unit_lookup_items = sorted(unit_lookup.items(), key=lambda kv: len(kv[0]), reverse=True)
 
-"""
-This is the main block of code that runs the script 
-that splits and scans PDFs, pages, tables
-"""
-for file in os.listdir(reports):
-    if not file.endswith(".pdf"): #check if file is a pdf
-        continue
+# Walks the reports folder once and yields the path of every pdf in it
+def pdf_paths_in(root: str):
+    with os.scandir(root) as it:
+        for e in it:
+            if e.is_file() and e.name.endswith(".pdf"):
+                yield e.path
 
-    new_path = os.path.join(reports, file) # Build filepath by joining folder + filename safely 
+# Parses one pdf's outcome tables into {column: values}
+def process_pdf(new_path: str) -> dict:
+    file = os.path.basename(new_path)
+    cols = {c: [] for c in ROW_COLUMNS} # The table row data from this pdf
 
     with pdfplumber.open(new_path) as pdf:
         for page in pdf.pages: # Extract pages
-            tables = page.extract_tables() or []
-            if not tables:
-                continue
-
-            page_title = get_page_title(page)
-            page_text = page.extract_text() or ""
+            try:
+                tables = page.extract_tables() or []
+                if not tables:
+                    continue
 
-            candidates = [] # Stores good tables
-            for t in tables:
-                if not t:
+                # Text is extracted once, and only for pages that have tables; the title comes from the same text
+                page_text = page.extract_text() or ""
+                page_title = get_page_title(page_text)
+
+                # Pick the best outcome table in one pass (the first one wins a tie, as with the old stable sort)
+                best_table = None
+                best_score = -1
+                for t in tables:
+                    if not t:
+                        continue
+                    check, score = is_outcomes_table(t)
+                    if check and score > best_score:
+                        best_table, best_score = t, score
+
+                if best_table is None:
                     continue
-                check, score = is_outcomes_table(t)
-                if check:
-                    candidates.append((score, t))
 
-            if not candidates:
-                continue
+                parsed = parse_outcomes_table(best_table)
+            
+                # Add “TOTAL” and “Not Seeking” from page text if missing
+                existing_outcomes = {p["outcome"].lower() for p in parsed}
+                for extra in get_total_and_not_seeking(page_text):
+                    if extra["outcome"].lower() not in existing_outcomes:
+                        parsed.append(extra)
+                # Add the parsed items to the columns that become the dataframe
+                for item in parsed:
+                    cols["pdf"].append(file)
+                    cols["title"].append(page_title)
+                    cols["outcome"].append(item["outcome"])
+                    cols["count"].append(item["count"])
+                    cols["percent"].append(item["percent"])
+            finally:
+                # Drops the layout pdfplumber cached for this page, so a worker holds one page's objects at a time
+                page.close()
+
+    return cols
+
+"""
+This is the main block of code that runs the script 
+that splits and scans PDFs (in parallel), pages, tables
+"""
+if __name__ == "__main__":
+    columns = {c: [] for c in ROW_COLUMNS} # The table row data, one list per column, to later transform into a DataFrame
+    pdf_paths = list(pdf_paths_in(reports))
 
-            candidates.sort(key=lambda x: x[0], reverse=True) #Pick best candidate
-            best_table = candidates[0][1]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for pdf_columns in ex.map(process_pdf, pdf_paths, chunksize=1):
+            for c in ROW_COLUMNS:
+                columns[c].extend(pdf_columns[c])
 
-            parsed = parse_outcomes_table(best_table)
-            
-            # Add “TOTAL” and “Not Seeking” from page text if missing
-            existing_outcomes = {p["outcome"].lower() for p in parsed}
-            for extra in get_total_and_not_seeking(page_text):
-                if extra["outcome"].lower() not in existing_outcomes:
-                    parsed.append(extra)
-            # Convert parsed items into rows to convert into dataframe
-            for item in parsed:
-                rows.append({
-                    "pdf": file,
-                    "title": page_title,
-                    "outcome": item["outcome"],
-                    "count": item["count"],
-                    "percent": item["percent"],})
-
-df = pd.DataFrame(rows)
-
-df["Year"] = df["pdf"].str.extract(r"(20\d{2})").astype("Int64") #Extract year from pdf filename
-df = df.rename(columns={"title": "Unit"})
-
-df["Unit"] = df["Unit"].apply(normalize_unit)
-df["Unit"] = (
-df["Unit"].astype(str).str.strip() # Extra cleanup after normalization
-      .str.replace(r"\s+", " ", regex=True)
-      .str.replace("–", "-", regex=False)
-      .str.replace("—", "-", regex=False))
-
-unit_order = [ # Order we want our units to be in 
-    "University-wide",
-    "College of Agriculture and Natural Resources",
-    "College of Arts and Humanities",
-    "College of Behavioral and Social Sciences",
-    "College of Computer, Mathematical, and Natural Sciences",
-    "College of Education",
-    "College of Information",
-    "The A. James Clark School of Engineering",
-    "Philip Merrill College of Journalism",
-    "School of Architecture, Planning, and Preservation",
-    "School of Public Health",
-    "School of Public Policy",
-    "The Robert H. Smith School of Business",
-    "College Park Scholars",
-    "Honors College",
-    "Letters and Sciences",
-    "Undergraduate Studies",
-]
+    df = pd.DataFrame(columns, copy=False)
 
-# Build lookup table to start matching
-unit_lookup = {unit_key(u): u for u in unit_order}
+    df["Year"] = df["pdf"].str.extract(r"(20\d{2})").astype("Int64") #Extract year from pdf filename
+    df = df.rename(columns={"title": "Unit"})
 
-# Clean inconsistinces with typos in several reports
-unit_lookup[unit_key("Phillip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
-unit_lookup[unit_key("Philip Merrill College of Journalism")]  = "Philip Merrill College of Journalism"
+    df["Unit"] = normalize_units(df["Unit"]) # already stripped, single-spaced and with plain dashes
 
-unit_lookup_items = sorted(unit_lookup.items(), key=lambda kv: len(kv[0]), reverse=True)
-df["Unit"] = df["Unit"].apply(canonicalize_unit)
-
-df["count"] = df["count"].astype(str).str.replace(",", "", regex=False)
-# finds rows where "count" is not a valid whole number and replaces those values with missing data
-df.loc[~df["count"].str.fullmatch(r"\d+"), "count"] = np.nan
-df["count"] = df["count"].astype("Int64")
-
-df["percent"] = df["percent"].fillna("").astype(str).str.replace(" ", "", regex=False)
-
-df["Outcome"] = df["outcome"].apply(outcome_key)
-df = df[df["Outcome"].notna()].copy()
-
-# Next we format the data into wide output table
-n = df.pivot_table(index=["Unit", "Year"], columns="Outcome", values="count", aggfunc="first")
-p = df.pivot_table(index=["Unit", "Year"], columns="Outcome", values="percent", aggfunc="first")
-out = pd.concat([n.add_suffix(" N"), p.add_suffix(" %")], axis=1).reset_index()
-
-# Calculate placement rate data
-unplaced = out.get("Unplaced %", "").apply(pct_to_float) if "Unplaced %" in out else np.nan
-unresolved = out.get("Unresolved %", "").apply(pct_to_float) if "Unresolved %" in out else np.nan
-if "Unplaced %" in out and "Unresolved %" in out:
-    out["Placement Rate %"] = (100 - unplaced - unresolved).round(1).astype(str) + "%"
-
-# Sorted order for units
-col_order = [
-    "Unit","Year",
-    "Employed FT N","Employed FT %",
-    "Employed PT N","Employed PT %",
-    "Continuing Edu N","Continuing Edu %",
-    "Volunteering N","Volunteering %",
-    "Military N","Military %",
-    "Business N","Business %",
-    "Unplaced N","Unplaced %",
-    "Unresolved N","Unresolved %",
-    "Total N",
-    "Not Seeking N",
-    "Placement Rate %",
-]
-out = out[[c for c in col_order if c in out.columns]]
-
-all_years = sorted(df["Year"].dropna().astype(int).unique())
-
-# Enforces blank rows for non existent units in previous years
-full_index = pd.MultiIndex.from_product([unit_order, all_years], names=["Unit", "Year"])
-
-out = out.set_index(["Unit", "Year"]).reindex(full_index).reset_index() #
-
-# Sort by Year first, then Unit order.
-out["Unit_cat"] = pd.Categorical(out["Unit"], categories=unit_order, ordered=True)
-out = (
-    out.sort_values(["Year", "Unit_cat"], ascending=[True, True])
-       .drop(columns=["Unit_cat"])
-       .reset_index(drop=True))
-
-# Finally we can export to CSV !!!
-out.to_csv("outcome_week1.csv", index=False)
\ No newline at end of file
+    df["Unit"] = canonicalize_units(df["Unit"])
+
+    df["count"] = df["count"].astype(str).str.replace(",", "", regex=False)
+    # finds rows where "count" is not a valid whole number and replaces those values with missing data
+    df.loc[~df["count"].str.fullmatch(r"\d+"), "count"] = np.nan
+    df["count"] = df["count"].astype("Int64")
+
+    df["percent"] = df["percent"].fillna("").astype(str).str.replace(" ", "", regex=False)
+
+    df["Outcome"] = outcome_keys(df["outcome"])
+    df = df[df["Outcome"].notna()].copy()
+
+    # Next we format the data into wide output table.
+    # One groupby takes the first count and percent of every (Unit, Year, Outcome), then each outcome
+    # is spread into its own " N" and " %" columns (all-empty columns are dropped, as pivot_table did)
+    wide = (
+        df.groupby(["Unit", "Year", "Outcome"])[["count", "percent"]]
+          .first()
+          .unstack("Outcome")
+          .dropna(axis=1, how="all")
+    )
+    suffix = {"count": " N", "percent": " %"}
+    wide.columns = [outcome + suffix[metric] for metric, outcome in wide.columns]
+    out = wide.reset_index()
+
+    # Calculate placement rate data
+    unplaced = pct_series_to_float(out["Unplaced %"]) if "Unplaced %" in out else np.nan
+    unresolved = pct_series_to_float(out["Unresolved %"]) if "Unresolved %" in out else np.nan
+    if "Unplaced %" in out and "Unresolved %" in out:
+        out["Placement Rate %"] = (100 - unplaced - unresolved).round(1).astype(str) + "%"
+
+    # Sorted order for units
+    col_order = [
+        "Unit","Year",
+        "Employed FT N","Employed FT %",
+        "Employed PT N","Employed PT %",
+        "Continuing Edu N","Continuing Edu %",
+        "Volunteering N","Volunteering %",
+        "Military N","Military %",
+        "Business N","Business %",
+        "Unplaced N","Unplaced %",
+        "Unresolved N","Unresolved %",
+        "Total N",
+        "Not Seeking N",
+        "Placement Rate %",
+    ]
+    out = out[[c for c in col_order if c in out.columns]]
+
+    all_years = sorted(df["Year"].dropna().astype(int).unique())
+
+    # Enforces blank rows for non existent units in previous years
+    full_index = pd.MultiIndex.from_product([unit_order, all_years], names=["Unit", "Year"])
+
+    out = out.set_index(["Unit", "Year"]).reindex(full_index).reset_index() #
+
+    # Sort by Year first, then Unit order (a small int key instead of a Categorical).
+    out["_urank"] = out["Unit"].map(unit_rank).astype("int16")
+    out = (
+        out.sort_values(["Year", "_urank"], ascending=[True, True])
+           .drop(columns=["_urank"])
+           .reset_index(drop=True))
+
+    # Finally we can export to CSV !!!
+    out.to_csv("outcome_week1.csv", index=False)
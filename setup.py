@@ -0,0 +1,16 @@
+"""
+Optional build step that compiles unit_text_utils.py to a C extension with mypyc
+(needs mypy installed: pip install mypy).
+    python setup.py build_ext --inplace
+The scripts import unit_text_utils the same way whether it has been compiled or not.
+A built unit_text_utils*.so takes precedence over the .py, so edits to the .py are ignored until you rebuild
+(or delete the .so)
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="unit_text_utils",
+    py_modules=["unit_text_utils"],
+    ext_modules=mypycify(["unit_text_utils.py"]),
+)
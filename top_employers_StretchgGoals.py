@@ -20,9 +20,9 @@ The following regex patterns help us locate and parse the "Top Employers" sectio
 
 HEADING_RE matches the start of the Top Employers block.
 STOP_RE detects when we've moved past the Top Employers block into another section.
-COUNT_LINE_RE detects a typical employer row like: "Deloitte 63"
-COUNT_ONLY_RE detects a line that is just a count (used when employer names wrap to the next line).
+(Employer rows like "Deloitte 63" are split by split_name_count below, without a regex.)
 YEAR_RE extracts the year from the PDF filename.
+WS_RE and LETTER_RE are the small helpers used on every line (runs of whitespace, any letter).
 """
 HEADING_RE = re.compile(r"\bTOP\s+EMPLOYERS\b", re.IGNORECASE)
 
@@ -32,35 +32,60 @@ STOP_RE = re.compile(
     re.IGNORECASE,
 )
 
-COUNT_LINE_RE = re.compile(r"^(?P<name>.+?)\s+(?P<count>\d[\d,]*)\s*$")
-COUNT_ONLY_RE = re.compile(r"^\d[\d,]*\s*$")
-
 YEAR_RE = re.compile(r"(20\d{2})")
+WS_RE = re.compile(r"\s+")
+LETTER_RE = re.compile(r"[A-Za-z]")
 
 # HELPER FUNCTIONS :)
 
 # Cleans up a line by removing weird spacing and making it easier to match with regex
+# (\s already covers the non-breaking space \u00a0)
 def normalize_line(ln: str) -> str:
-    return re.sub(r"\s+", " ", (ln or "").replace("\u00a0", " ")).strip()
+    return WS_RE.sub(" ", ln or "").strip()
+
+# Splits a typical employer row like "Deloitte 63" into ("Deloitte", "63") by walking back from the end
+# over the count (a digit followed by digits/commas). A line that is just a count (used when employer names
+# wrap to the next line) gives ("", count), and a line that doesn't end in a count gives None
+def split_name_count(ln: str):
+    s = ln.rstrip()
+    i = len(s)
+    while i and (s[i - 1].isdecimal() or s[i - 1] == ","):
+        i -= 1
+
+    if i == len(s) or not s[i].isdecimal():
+        return None
+    if i == 0:
+        return "", s
+    if not s[i - 1].isspace():
+        return None
+
+    return s[:i].rstrip(), s[i:]
 
 # Extracts the year (e.g. 2019) from a PDF filename using regex
 def year_from_filename(filename: str):
     m = YEAR_RE.search(filename)
     return int(m.group(1)) if m else None
 
+# Walks the reports folder once and yields (path, year) for every pdf in it.
+# DirEntry already carries the full path, so no os.path.join is needed per file
+def pdf_entries(root: str):
+    with os.scandir(root) as it:
+        for e in it:
+            if e.is_file() and e.name.lower().endswith(".pdf"):
+                yield e.path, year_from_filename(e.name)
+
 """
 This function is the main heart of the script.
 It finds the Top Employers heading inside a PDF and returns ONLY the first employer listed
 """
 def extract_top_employer(pdf_path: str, max_pages: int = 25):
     collecting = False  # Tracks whether we've found the Top Employers heading yet
-    buffer = ""
+    buffer = []  # Pieces of a wrapped employer name, joined only when the name is returned
 
-    with pdfplumber.open(pdf_path) as pdf:
-        n_pages = min(max_pages, len(pdf.pages))
-
-        for p in range(n_pages):
-            text = pdf.pages[p].extract_text() or ""
+    # Only the first max_pages pages are loaded at all (pdfplumber page numbers start at 1)
+    with pdfplumber.open(pdf_path, pages=list(range(1, max_pages + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
             lines = [normalize_line(x) for x in text.splitlines()]
 
             for ln in lines:
@@ -70,9 +95,11 @@ def extract_top_employer(pdf_path: str, max_pages: int = 25):
                 # Find the heading line "TOP EMPLOYERS ..."
                 if not collecting:
                     # Avoid internship-related headings if they appear
-                    if HEADING_RE.search(ln) and "INTERNSHIP" not in ln.upper() and "SAMPLE" not in ln.upper():
-                        collecting = True
-                        buffer = ""
+                    if HEADING_RE.search(ln):
+                        up = ln.upper()
+                        if "INTERNSHIP" not in up and "SAMPLE" not in up:
+                            collecting = True
+                            buffer = []
                     continue
 
                 # If we hit another major section before grabbing a top employer, stop
@@ -80,27 +107,28 @@ def extract_top_employer(pdf_path: str, max_pages: int = 25):
                     return ""
 
                 # Skip header-ish lines that aren't actual employer entries
-                if HEADING_RE.search(ln) or ln.upper().startswith("REPORTED") or ln.upper().startswith("TOP EMPLOYERS"):
+                up = ln.upper()
+                if HEADING_RE.search(ln) or up.startswith("REPORTED") or up.startswith("TOP EMPLOYERS"):
                     continue
 
                 # Typical case: employer + count on the same line ("Deloitte 63")
-                m = COUNT_LINE_RE.match(ln)
-                if m:
-                    name = normalize_line(m.group("name"))
+                name_count = split_name_count(ln)
+                if name_count and name_count[0]:
+                    name = normalize_line(name_count[0])
 
                     # If part of the name was on previous line, combine it
                     if buffer:
-                        name = normalize_line(buffer + " " + name)
-                        buffer = ""
+                        name = normalize_line(" ".join(buffer) + " " + name)
                     return name
 
                 # Wrapped case: employer name stored in buffer, count appears on next line
-                if buffer and COUNT_ONLY_RE.match(ln):
-                    return buffer
+                if buffer and name_count:
+                    return " ".join(buffer)
 
                 # If line contains letters, treat it as part of a wrapped employer name
-                if re.search(r"[A-Za-z]", ln) and not STOP_RE.search(ln):
-                    buffer = normalize_line((buffer + " " + ln).strip()) if buffer else ln
+                # (a stop line already returned above)
+                if LETTER_RE.search(ln):
+                    buffer.append(ln)
 
     return "" 
 
@@ -114,18 +142,14 @@ pulls the top employer for that year, and writes everything into a CSV.
 year_to_pdf = {}   # Maps years to pdf file path (so we can output one row per year)
 years_found = set() 
 
-for filename in os.listdir(reports):
-    if not filename.lower().endswith(".pdf"):
-        continue
-    # Extract year from filename
-    year = year_from_filename(filename)  
+for pdf_path, year in pdf_entries(reports):
     if year is None:
         continue
 
     years_found.add(year)
 
     if year not in year_to_pdf:
-        year_to_pdf[year] = os.path.join(reports, filename)
+        year_to_pdf[year] = pdf_path
 
 # For each year we found, extract the top employer and build output rows
 for year in sorted(years_found):
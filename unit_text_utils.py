@@ -0,0 +1,256 @@
+"""
+Text helpers shared by employment_search_week2.py and internship_salary_week3.py
+(outcome_extraction_week1.py also takes unit_order and unit_rank from here).
+They run on every line of every page, so they live in their own module with full type annotations:
+that lets setup.py compile this file to a C extension with mypyc (python setup.py build_ext --inplace).
+If it has not been compiled, the scripts import this plain Python file and the results are the same.
+Once built, the unit_text_utils*.so is imported instead of this file, so rebuild after editing it
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# percent_re matches a cell that is only a percent, like 90.0% or <1%
+percent_re = re.compile(r"^<?\d+(?:\.\d+)?%$")
+
+# Whitespace, word and unit-name patterns
+WS_RE = re.compile(r"\s+")
+WORD_RE = re.compile(r"[a-z]+")
+NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+UNIWIDE_RE = re.compile(r"university\s*[- ]\s*wide|universitywide")
+
+# A filter for words that are common and aren't real labels
+HEADER_WORDS = {"method", "methods", "used", "find", "employment", "search"}
+
+# The official list of units, in the order the output tables use
+unit_order = [
+    "University-wide",
+    "College of Agriculture and Natural Resources",
+    "College of Arts and Humanities",
+    "College of Behavioral and Social Sciences",
+    "College of Computer, Mathematical, and Natural Sciences",
+    "College of Education",
+    "College of Information",
+    "The A. James Clark School of Engineering",
+    "Philip Merrill College of Journalism",
+    "School of Architecture, Planning, and Preservation",
+    "School of Public Health",
+    "School of Public Policy",
+    "The Robert H. Smith School of Business",
+    "College Park Scholars",
+    "Honors College",
+    "Letters and Sciences",
+    "Undergraduate Studies",
+]
+# Position of each unit in unit_order, used as an integer sort key for the output tables
+unit_rank: Dict[str, int] = {u: i for i, u in enumerate(unit_order)}
+
+# Function to convert input to a string and remove any and all whitespaces
+def clean(x: object) -> str:
+    if x is None:
+        return ""
+    return str(x).replace("\n", " ").strip()
+
+# Remove spaces and detects if input is a percentage
+def is_percent(x: object) -> bool:
+    return bool(percent_re.match(clean(x).replace(" ", "")))
+
+# Checks whether or not input is a valid label
+def is_label(s: object) -> bool:
+    t = clean(s)
+    if not t:
+        return False
+    if is_percent(t):
+        return False
+    if t.replace(",", "").isdigit():
+        return False
+
+    # A label needs at least one word that isn't a header word; stop at the first one found
+    for m in WORD_RE.finditer(t.lower()):
+        if m.group() not in HEADER_WORDS:
+            return True
+
+    return False
+
+# clean unit strings + detect University-wide
+def normalize_unit(u: str) -> str:
+    u = str(u or "").strip()
+    u = WS_RE.sub(" ", u)
+    u = u.replace("–", "-").replace("—", "-")
+
+    low = u.lower()
+
+    if "university of maryland" in low and "overall" in low:
+        return "University-wide"
+    if UNIWIDE_RE.search(low):
+        return "University-wide"
+    if low == "university of maryland":
+        return "University-wide"
+
+    return u
+
+# build a “matching key” for unit strings
+def unit_key(s: str) -> str:
+    s = str(s or "").lower()
+    s = s.replace("–", "-").replace("—", "-")
+    s = s.replace("&", " and ")
+    s = NONALNUM_RE.sub(" ", s)
+    s = WS_RE.sub(" ", s).strip()
+    toks = [t for t in s.split() if t != "and"]
+    return " ".join(toks)
+
+# Some years have typos or older names, so unit_lookup also catches those variations
+unit_lookup: Dict[str, str] = {unit_key(u): u for u in unit_order}
+unit_lookup[unit_key("Phillip Merrill College of Journalism")] = "Philip Merrill College of Journalism"
+unit_lookup[unit_key("Robert H. Smith School of Business")] = "The Robert H. Smith School of Business"
+unit_lookup[unit_key("Robert H Smith School of Business")] = "The Robert H. Smith School of Business"
+unit_lookup[unit_key("Office of Undergraduate Studies")] = "Undergraduate Studies"
+unit_lookup[unit_key("Division of Undergraduate Studies")] = "Undergraduate Studies"
+unit_lookup[unit_key("College of Information Studies")] = "College of Information"
+
+# Every lookup key plus the University-wide spellings canonicalize_unit recognises, as one pattern.
+# If none of them occur in the key of a page's header, no 1-3 line window there can be a unit
+UNIT_SCAN_RE = re.compile("|".join(
+    re.escape(k)
+    for k in sorted(set(unit_lookup) | {"university wide", "universitywide", "university of maryland"}, key=len, reverse=True)
+))
+
+# Maps a unit string to its official name (or returns it normalized if it isn't a known unit).
+# The only cache in the unit pipeline; one-off header windows age out of it
+@lru_cache(maxsize=4096)
+def canonicalize_unit(u: str) -> str:
+    u = normalize_unit(u)
+    return unit_lookup.get(unit_key(u), u)
+
+# Splits page text into its non-empty, stripped lines.
+# Done once per page; the unit and section helpers all take these lines instead of the raw text
+def page_lines(page_text: str) -> Tuple[str, ...]:
+    return tuple(ln.strip() for ln in (page_text or "").splitlines() if ln.strip())
+
+# Returns the official unit name if s (with " ," tidied up) is one, else None
+def unit_candidate(s: str) -> Optional[str]:
+    cand = canonicalize_unit(s.replace(" ,", ","))
+    return cand if cand in unit_order else None
+
+# Scan first ~60 lines for a unit name (handles titles wrapped over 2-3 lines)
+def extract_unit_candidate(lines: Tuple[str, ...]) -> Optional[str]:
+    max_scan = min(60, len(lines))
+
+    # One scan over the whole header rules out most pages before any window is canonicalized
+    if not UNIT_SCAN_RE.search(unit_key(" ".join(lines[:max_scan]))):
+        return None
+
+    for i in range(max_scan):
+        hit = unit_candidate(lines[i])
+        if hit:
+            return hit
+
+        if i + 1 < max_scan:
+            two = (lines[i].rstrip(",") + " " + lines[i + 1]).strip()
+            hit = unit_candidate(two)
+            if hit:
+                return hit
+
+        if i + 2 < max_scan:
+            three = (lines[i].rstrip(",") + " " + lines[i + 1] + " " + lines[i + 2]).strip()
+            hit = unit_candidate(three)
+            if hit:
+                return hit
+
+    return None
+
+# Bit flags for the keywords method_key cares about.
+# One scan over a label collects every keyword it contains into a single int
+M_INTERN = 1 << 0
+M_CAREER_FAIR = 1 << 1
+M_NON_UMD = 1 << 2
+M_OFF_CAMPUS = 1 << 3
+M_ONLINE = 1 << 4
+M_UMD_SITE = 1 << 5
+M_INTERVIEW = 1 << 6
+M_ON_CAMPUS = 1 << 7
+M_FAMILY = 1 << 8
+M_FACULTY = 1 << 9
+M_CONTACT = 1 << 10
+M_EMPLOYED = 1 << 11
+M_NEWSPAPER = 1 << 12
+
+METHOD_KEYWORDS: Dict[str, int] = {
+    "intern": M_INTERN,
+    "co-op": M_INTERN,
+    "coop": M_INTERN,
+    "career fair": M_CAREER_FAIR,
+    "non-umd": M_NON_UMD,
+    "non umd": M_NON_UMD,
+    "off campus": M_OFF_CAMPUS,
+    "off-campus": M_OFF_CAMPUS,
+    "online": M_ONLINE,
+    "job site": M_ONLINE,
+    "jobsite": M_ONLINE,
+    "company website": M_ONLINE,
+    "company site": M_ONLINE,
+    "social media": M_ONLINE,
+    "umd online job site": M_UMD_SITE,
+    "handshake": M_UMD_SITE,
+    "hiresmith": M_UMD_SITE,
+    "careers4terps": M_UMD_SITE,
+    "interview": M_INTERVIEW,
+    "on campus": M_ON_CAMPUS,
+    "on-campus": M_ON_CAMPUS,
+    "campus/virtual": M_ON_CAMPUS,
+    "virtual": M_ON_CAMPUS,
+    "family": M_FAMILY,
+    "friends": M_FAMILY,
+    "faculty": M_FACULTY,
+    "staff": M_FACULTY,
+    "contact": M_CONTACT,
+    "currently employed": M_EMPLOYED,
+    "newspaper": M_NEWSPAPER,
+}
+# The lookahead lets matches overlap (e.g. "umd online job site" also holds "online"),
+# so every keyword occurrence is reported just like a separate `in` check would
+METHOD_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(METHOD_KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+# Standardize employment-search method labels
+@lru_cache(maxsize=4096)
+def method_key(s: str) -> Optional[str]:
+    s = (s or "").lower()
+    s = WS_RE.sub(" ", s).strip()
+
+    flags = 0
+    for m in METHOD_KEYWORD_RE.finditer(s):
+        flags |= METHOD_KEYWORDS[m.group(1)]
+
+    if flags & M_INTERN:
+        return "Previous Internship/Co-op %"
+
+    if flags & M_CAREER_FAIR:
+        if flags & (M_NON_UMD | M_OFF_CAMPUS):
+            return "Career Fairs Off Campus %"
+        return "Career Fairs On Campus %"
+
+    if flags & M_NON_UMD and flags & M_ONLINE:
+        return "Non-UMD Online Job Site %"
+
+    if flags & M_UMD_SITE and not flags & M_NON_UMD:
+        return "UMD Online Job Site %"
+
+    if flags & M_INTERVIEW and flags & M_ON_CAMPUS:
+        return "On-campus Interviews %"
+
+    if flags & M_FAMILY and flags & M_CONTACT:
+        return "Contacts Family/Friends %"
+    if flags & M_FACULTY and flags & M_CONTACT:
+        return "Contacts Faculty %"
+
+    if flags & M_EMPLOYED:
+        return "Currently Employed with Org %"
+
+    if flags & M_NEWSPAPER:
+        return "Newspaper %"
+    if s == "other":
+        return "Other %"
+
+    return None